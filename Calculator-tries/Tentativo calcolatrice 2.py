@@ -1,28 +1,83 @@
+import ast
+import operator
 import tkinter as tk
+from functools import lru_cache
 
-calculation = ""
+# i simboli inseriti si accumulano in un bytearray (aggiunta in tempo costante)
+# e vengono decodificati solo quando serve mostrarli o calcolarli
+_buf = bytearray()
 
 def add_to_calculation(symbol):
-    global calculation
-    caluclation += str(symbol)
+    _buf.extend(str(symbol).encode("ascii"))
+    s = _buf.decode("ascii")
     text_result.delete(1.0, "end")
-    text_result.insert(1.0, calculation)
+    text_result.insert(1.0, s)
+
+
+# limite per le potenze tra interi: senza, un'espressione come 9**9**9 bloccherebbe
+# la finestra. Con i float non serve: sono veloci e danno OverflowError da soli
+_MAX_POW_BITS = 4096
+
+
+def _safe_pow(base, exponent):
+    if (isinstance(base, int) and isinstance(exponent, int) and abs(base) > 1
+            and exponent > 0 and (base.bit_length() - 1) * exponent > _MAX_POW_BITS):
+        raise ValueError("risultato troppo grande")
+    return operator.pow(base, exponent)
+
+
+# operazioni permesse: solo aritmetica, niente nomi o chiamate a funzioni
+_BIN_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _safe_pow,
+}
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+@lru_cache(maxsize=256)
+def _parse(expr):
+    # la stessa espressione viene analizzata una volta sola
+    return ast.parse(expr, mode="eval").body
+
+
+def _eval_node(node):
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+        result = _BIN_OPS[type(node.op)](_eval_node(node.left), _eval_node(node.right))
+    elif isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        result = _UNARY_OPS[type(node.op)](_eval_node(node.operand))
+    else:
+        raise ValueError("espressione non valida")
+    # solo numeri reali: ad esempio (-8)**0.5 darebbe un numero complesso
+    if isinstance(result, complex):
+        raise ValueError("risultato complesso")
+    return result
 
 
 def evaluate_calculation():
-    global calculation
     try:
-        calculation = str(eval(calculation))
+        s = _buf.decode("ascii")
+        val = str(_eval_node(_parse(s)))
+        _buf.clear()
+        _buf.extend(val.encode("ascii"))
         text_result.delete(1.0, "end")
-        text_result.insert(1.0, calculation)
+        text_result.insert(1.0, val)
     except:
         clear_field()
         text_result.insert(1.0, "Error")
         
 
 def clear_field():
-    global calculation
-    calculation=""
+    _buf.clear()
     text_result.delete(1.0, "end")# Qui andrebbe il codice per pulire il campo
 
 root = tk.Tk()
@@ -31,26 +86,14 @@ root.geometry("600x300")
 text_result= tk.Text(root, height=2, width=34, font=("Arial", 24))
 text_result.grid(columnspan=5)
 
-btn_1=tk.Button(root, text="1", command=lambda: add_to_calculation(1), width=10, font=("Arial", 14))
-btn_1.grid(row=2, column=1)
-btn_2=tk.Button(root, text="2", command=lambda: add_to_calculation(2), width=10, font=("Arial", 14))
-btn_2.grid(row=2, column=2)
-btn_3=tk.Button(root, text="3", command=lambda: add_to_calculation(3), width=10, font=("Arial", 14))
-btn_3.grid(row=2, column=3)
-btn_4=tk.Button(root, text="4", command=lambda: add_to_calculation(4), width=10, font=("Arial", 14))
-btn_4.grid(row=3, column=1)
-btn_5=tk.Button(root, text="5", command=lambda: add_to_calculation(5), width=10, font=("Arial", 14))
-btn_5.grid(row=3, column=2)
-btn_6=tk.Button(root, text="6", command=lambda: add_to_calculation(6), width=10, font=("Arial", 14))
-btn_6.grid(row=3, column=3)
-btn_7=tk.Button(root, text="7", command=lambda: add_to_calculation(7), width=10, font=("Arial", 14))
-btn_7.grid(row=4, column=1)
-btn_8=tk.Button(root, text="8", command=lambda: add_to_calculation(8), width=10, font=("Arial", 14))
-btn_8.grid(row=3, column=2)
-btn_9=tk.Button(root, text="9", command=lambda: add_to_calculation(9), width=10, font=("Arial", 14))
-btn_9.grid(row=3, column=3)
-btn_0=tk.Button(root, text="0", command=lambda: add_to_calculation(0), width=10, font=("Arial", 14))
-btn_0.grid(row=4, column=2)
+# (cifra, riga, colonna) di ogni bottone numerico
+LAYOUT = [(1, 2, 1), (2, 2, 2), (3, 2, 3),
+          (4, 3, 1), (5, 3, 2), (6, 3, 3),
+          (7, 4, 1), (8, 4, 2), (9, 4, 3),
+          (0, 5, 2)]
+for v, r, c in LAYOUT:
+    btn = tk.Button(root, text=str(v), command=lambda v=v: add_to_calculation(v), width=10, font=("Arial", 14))
+    btn.grid(row=r, column=c)
 
 root.mainloop()
 
@@ -1,5 +1,5 @@
-# Importa il modulo 'random' per generare numeri casuali
-import random
+# Importa il modulo 'numpy' per generare numeri casuali in blocco
+import numpy as np
 
 # Importa il modulo 'time' per gestire il tempo (non sarà usato direttamente con tkinter)
 import time
@@ -7,6 +7,32 @@ import time
 # Importa il modulo 'tkinter' per creare l'interfaccia grafica
 import tkinter as tk
 
+# Crea un unico generatore di numeri casuali, riusato a ogni chiamata
+_rng = np.random.default_rng()
+
+# Righe scritte a ogni chiamata (6 numeri ciascuna): una sola insert ogni
+# 700 ms invece di una riga ogni 35 ms, con la stessa velocità di scorrimento
+NUMERI_PER_RIGA = 6
+RIGHE_PER_CHIAMATA = 20
+NUMERI_PER_CHIAMATA = NUMERI_PER_RIGA * RIGHE_PER_CHIAMATA
+
+# Riserva di numeri casuali generata una volta sola (circa 2 MB):
+# a ogni chiamata se ne prendono quanti servono spostando il cursore,
+# e quando la riserva finisce viene rigenerata tutta insieme
+_POOL = _rng.integers(0, 32768, size=1_000_000, dtype=np.uint16)
+_CURSOR = 0
+
+# Numero massimo di righe tenute nel widget: le più vecchie vengono
+# cancellate, così il testo non cresce all'infinito e insert/see restano
+# veloci. Il controllo si fa solo ogni CONTROLLO_OGNI chiamate
+MAX_LINES = 2000
+CONTROLLO_OGNI = 10
+_TICK = 0
+
+# Tabella con la stringa di ogni numero da 0 a 32767, calcolata una volta:
+# così a ogni riga basta un accesso per indice invece di str()
+_STRS = list(map(str, range(32768)))
+
 # Crea una nuova finestra
 root = tk.Tk()
 root.title("cmd")
@@ -19,28 +45,56 @@ root.configure(bg="black")
 text_widget = tk.Text(root, bg="black", fg="lime", font=("Courier", 12))
 text_widget.pack(expand=True, fill=tk.BOTH)
 
-# Rende il widget non modificabile
-text_widget.configure(state=tk.DISABLED)
+# Rende il widget non modificabile dall'utente: il widget resta in stato
+# NORMAL (così non serve cambiarne lo stato a ogni riga) e tasti e clic
+# vengono bloccati restituendo "break"
+text_widget.bind("<Key>", lambda e: "break")
+text_widget.bind("<Button-1>", lambda e: "break")
+text_widget.bind("<Button-2>", lambda e: "break")
+
+# Salva una volta i riferimenti usati a ogni chiamata: il nome Tcl del
+# widget e la funzione che esegue i comandi Tcl direttamente (come fa
+# tkinter al suo interno), così si saltano i wrapper Python di insert/see
+_tcl = root.tk.call
+_w = str(text_widget)
+_after = root.after
 
 # Funzione per aggiungere numeri casuali alla finestra
 def stampa_numeri():
-    # Genera una riga di 6 numeri casuali
-    numeri = ' '.join(str(random.randint(0, 32767)) for _ in range(6)) + '\n'
+    global _CURSOR, _TICK
+
+    # Se nella riserva non restano abbastanza numeri, rigenerala
+    if _CURSOR + NUMERI_PER_CHIAMATA > _POOL.size:
+        _POOL[:] = _rng.integers(0, 32768, size=_POOL.size, dtype=np.uint16)
+        _CURSOR = 0
+
+    # Prendi 20 righe di 6 numeri casuali dalla riserva e convertili in testo
+    # tramite la tabella (tolist() dà int Python, usabili come indici)
+    nums = _POOL[_CURSOR:_CURSOR + NUMERI_PER_CHIAMATA].tolist()
+    _CURSOR += NUMERI_PER_CHIAMATA
+    numeri = '\n'.join(
+        ' '.join([_STRS[i] for i in nums[j:j + NUMERI_PER_RIGA]])
+        for j in range(0, NUMERI_PER_CHIAMATA, NUMERI_PER_RIGA)
+    ) + '\n'
     
-    # Rendi il widget modificabile temporaneamente
-    text_widget.configure(state=tk.NORMAL)
+    # Inserisci tutte le righe con un'unica chiamata
+    _tcl(_w, 'insert', 'end', numeri)
     
-    # Inserisci il testo
-    text_widget.insert(tk.END, numeri)
+    # Ogni tanto cancella le righe più vecchie oltre il limite
+    _TICK += 1
+    if _TICK >= CONTROLLO_OGNI:
+        _TICK = 0
+        # 'end-1c' è l'ultima riga (vuota, dopo l'ultimo '\n'): le righe scritte sono una in meno
+        righe = int(text_widget.index('end-1c').split('.')[0]) - 1
+        eccesso = righe - MAX_LINES
+        if eccesso > 0:
+            text_widget.delete('1.0', f'{eccesso + 1}.0')
     
     # Scorri automaticamente verso il basso
-    text_widget.see(tk.END)
-    
-    # Rendi il widget di nuovo non modificabile
-    text_widget.configure(state=tk.DISABLED)
+    _tcl(_w, 'see', 'end')
     
-    # Richiama questa funzione ogni 50 millisecondi (0.05 secondi)
-    root.after(35, stampa_numeri)
+    # Richiama questa funzione ogni 700 millisecondi (20 righe da 35 ms)
+    _after(35 * RIGHE_PER_CHIAMATA, stampa_numeri)
 
 # Avvia la stampa dei numeri
 stampa_numeri()
@@ -7,7 +7,7 @@ Mini terminale per rumore bianco in Python.
 Funzionalità:
 - Verifica/installa librerie necessarie (numpy, scipy, sounddevice, matplotlib) usando subprocess.
 - Genera rumore bianco (gaussiano) con numpy.
-- Riproduce il rumore bianco con sounddevice.
+- Riproduce il rumore bianco con sounddevice (anche in streaming, senza buffer).
 - Salva il rumore bianco in un file WAV con scipy.
 - Visualizza il segnale e lo spettro con matplotlib.
 - Interfaccia testuale semplice per eseguire le operazioni.
@@ -18,7 +18,9 @@ Nota: Esegui questo script con Python 3.6+.
 import sys
 import subprocess
 import importlib
+import importlib.util
 import shutil
+import time
 from typing import List, Tuple
 
 
@@ -47,9 +49,29 @@ def pip_available() -> bool:
 
 def install_packages(packages: List[str]) -> List[Tuple[str, bool, str]]:
     """
-    Installa i pacchetti richiesti usando 'python -m pip install <package>'.
+    Installa i pacchetti richiesti con un'unica chiamata
+    'python -m pip install <package> <package> ...' (pip si avvia una sola volta).
+    Se l'installazione in blocco fallisce, riprova un pacchetto alla volta
+    per capire quale causa l'errore.
     Ritorna una lista di tuple (package, success, message).
     """
+    print(f"\n[INFO] Installazione di: {', '.join(packages)}...")
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-m", "pip", "install", "--upgrade", *packages],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            check=False
+        )
+        if proc.returncode == 0:
+            print(proc.stdout)
+            return [(pkg, True, proc.stdout) for pkg in packages]
+        print(proc.stderr)
+    except Exception as e:
+        print(f"Errore durante l'installazione: {e}")
+
+    print("[INFO] Installazione in blocco non riuscita, riprovo un pacchetto alla volta.")
     results = []
     for pkg in packages:
         print(f"\n[INFO] Installazione di '{pkg}'...")
@@ -74,11 +96,12 @@ def install_packages(packages: List[str]) -> List[Tuple[str, bool, str]]:
 
 def ensure_import(module_name: str) -> bool:
     """
-    Prova ad importare un modulo. Se fallisce, ritorna False.
+    Controlla se un modulo è installato, senza importarlo davvero
+    (importare numpy/matplotlib solo per verificarne la presenza è lento).
+    Se non viene trovato, ritorna False.
     """
     try:
-        importlib.import_module(module_name)
-        return True
+        return importlib.util.find_spec(module_name) is not None
     except Exception:
         return False
 
@@ -109,7 +132,9 @@ def ensure_dependencies() -> None:
     print(f"[INFO] Mancano i seguenti pacchetti: {', '.join(missing)}")
     results = install_packages(missing)
 
-    # Riprova import dopo installazione
+    # Riprova import dopo installazione (svuotando le cache dei percorsi,
+    # altrimenti i pacchetti appena installati potrebbero non essere visti)
+    importlib.invalidate_caches()
     still_missing = [pkg for pkg, success, _ in results if not success or not ensure_import(pkg)]
     if still_missing:
         print(f"[ERRORE] Non sono riuscito a rendere disponibili: {', '.join(still_missing)}")
@@ -123,6 +148,9 @@ def ensure_dependencies() -> None:
 # Sezione: logica rumore e utilità
 # ---------------------------------
 
+# Valore massimo di un campione int16, usato per la conversione in WAV
+_MAX_INT16 = 32767
+
 def generate_white_noise(duration_sec: float = 2.0, sample_rate: int = 48000, amplitude: float = 0.2):
     """
     Genera rumore bianco gaussiano:
@@ -137,8 +165,10 @@ def generate_white_noise(duration_sec: float = 2.0, sample_rate: int = 48000, am
     # Numero di campioni totali = durata * frequenza di campionamento
     n_samples = int(duration_sec * sample_rate)
 
-    # Rumore bianco: distribuzione normale media 0, varianza 1
-    noise = np.random.normal(loc=0.0, scale=1.0, size=n_samples).astype(np.float32)
+    # Rumore bianco: distribuzione normale media 0, varianza 1.
+    # Generiamo direttamente in float32, senza passare da un array float64.
+    rng = np.random.default_rng()
+    noise = rng.standard_normal(n_samples, dtype=np.float32)
 
     # Ridimensioniamo l'ampiezza per evitare clipping in riproduzione
     noise *= amplitude
@@ -157,6 +187,36 @@ def play_audio(buffer, sample_rate: int = 48000):
     print("[OK] Riproduzione terminata.")
 
 
+def stream_white_noise(duration_sec: float = 2.0, sample_rate: int = 48000, amplitude: float = 0.2,
+                       blocksize: int = 256):
+    """
+    Riproduce rumore bianco in streaming con 'sounddevice.OutputStream':
+    i campioni vengono generati a blocchi (blocksize) direttamente nel callback,
+    senza creare in memoria il buffer completo. Ctrl+C interrompe la riproduzione.
+    """
+    import numpy as np
+    import sounddevice as sd
+
+    rng = np.random.default_rng()
+
+    def callback(outdata, frames, time, status):
+        # Riempiamo il blocco richiesto da PortAudio con nuovi campioni
+        if status:
+            print(status)
+        outdata[:, 0] = rng.standard_normal(frames, dtype=np.float32) * amplitude
+
+    print("[INFO] Riproduzione audio in streaming in corso (Ctrl+C per fermare)...")
+    try:
+        with sd.OutputStream(samplerate=sample_rate, channels=1, blocksize=blocksize,
+                             dtype="float32", latency="low", callback=callback):
+            # time.sleep (a differenza di sd.sleep) può essere interrotto da Ctrl+C
+            time.sleep(duration_sec)
+    except KeyboardInterrupt:
+        print("[INFO] Riproduzione interrotta.")
+        return
+    print("[OK] Riproduzione terminata.")
+
+
 def save_wav(buffer, sample_rate: int = 48000, filename: str = "white_noise.wav"):
     """
     Salva l'audio in un file WAV usando scipy.io.wavfile.
@@ -167,8 +227,12 @@ def save_wav(buffer, sample_rate: int = 48000, filename: str = "white_noise.wav"
 
     # Conversione float32 [-1,1] ~> int16 [-32768,32767]
     # Nota: Se l'ampiezza è troppo alta, si verifica clipping.
-    max_int16 = np.iinfo(np.int16).max
-    wav_int16 = (buffer * max_int16).clip(-max_int16, max_int16).astype(np.int16)
+    # Un solo array temporaneo (il buffer originale non viene modificato, serve ancora
+    # per riproduzione e grafici): clipping, scaling e arrotondamento avvengono "in place".
+    scratch = np.clip(buffer, -1.0, 1.0)
+    np.multiply(scratch, _MAX_INT16, out=scratch)
+    np.rint(scratch, out=scratch)
+    wav_int16 = scratch.astype(np.int16)
 
     wavfile.write(filename, sample_rate, wav_int16)
     print(f"[OK] File WAV salvato: {filename}")
@@ -180,13 +244,21 @@ def plot_signal_and_spectrum(buffer, sample_rate: int = 48000):
     """
     import numpy as np
     import matplotlib.pyplot as plt
-
-    # Tempo in secondi per asse x del segnale
-    t = np.arange(buffer.shape[0]) / sample_rate
-
-    # FFT per spettro (modulo)
-    fft = np.fft.rfft(buffer)
-    freqs = np.fft.rfftfreq(buffer.shape[0], d=1.0 / sample_rate)
+    from scipy.fft import rfft, rfftfreq, next_fast_len
+
+    # Tempo in secondi per asse x del segnale.
+    # Disegniamo al massimo ~10000 punti (una vista decimata, senza copie): a schermo
+    # non si vedrebbe comunque di più, e si evita un asse dei tempi grande come il buffer.
+    step = max(1, -(-buffer.shape[0] // 10000))
+    decimated = buffer[::step]
+    t = np.arange(decimated.shape[0]) * (step / sample_rate)
+
+    # FFT per spettro (modulo).
+    # Lunghezza estesa (zero-padding) alla taglia "veloce" più vicina, per evitare
+    # lunghezze con fattori primi grandi; workers=-1 usa tutti i core disponibili.
+    n_fft = next_fast_len(buffer.shape[0], real=True)
+    fft = rfft(buffer, n=n_fft, workers=-1)
+    freqs = rfftfreq(n_fft, d=1.0 / sample_rate)
     magnitude = np.abs(fft)
 
     # Plot in due sottografici
@@ -194,7 +266,7 @@ def plot_signal_and_spectrum(buffer, sample_rate: int = 48000):
 
     plt.subplot(1, 2, 1)
     plt.title("Segnale nel tempo (rumore bianco)")
-    plt.plot(t, buffer, color="tab:blue", linewidth=0.8)
+    plt.plot(t, decimated, color="tab:blue", linewidth=0.8)
     plt.xlabel("Tempo [s]")
     plt.ylabel("Ampiezza")
 
@@ -222,9 +294,25 @@ def print_menu():
     print("4. Salva rumore bianco in WAV")
     print("5. Visualizza segnale e spettro")
     print("6. Esci")
+    print("7. Riproduci rumore bianco in streaming (senza buffer)")
     print("====================================")
 
 
+def ask_noise_params():
+    """
+    Chiede all'utente durata, sample rate e ampiezza del rumore.
+    Ritorna la tupla (durata, sample_rate, ampiezza), oppure None se i valori non sono validi.
+    """
+    try:
+        dur = float(input("Durata in secondi (es. 2.0): ").strip() or "2.0")
+        sr = int(input("Sample rate in Hz (es. 48000): ").strip() or "48000")
+        amp = float(input("Ampiezza (0.0-1.0, es. 0.2): ").strip() or "0.2")
+    except ValueError:
+        print("[ERRORE] Parametri non validi. Riprova.")
+        return None
+    return dur, sr, amp
+
+
 def main():
     """
     Punto di ingresso del mini terminale.
@@ -240,7 +328,7 @@ def main():
 
     while True:
         print_menu()
-        choice = input("Seleziona un'opzione (1-6): ").strip()
+        choice = input("Seleziona un'opzione (1-7): ").strip()
 
         if choice == "1":
             # Utente vuole rieseguire la verifica (utile se si cambia ambiente)
@@ -248,13 +336,10 @@ def main():
 
         elif choice == "2":
             # Parametri personalizzabili dall'utente
-            try:
-                dur = float(input("Durata in secondi (es. 2.0): ").strip() or "2.0")
-                sr = int(input("Sample rate in Hz (es. 48000): ").strip() or "48000")
-                amp = float(input("Ampiezza (0.0-1.0, es. 0.2): ").strip() or "0.2")
-            except ValueError:
-                print("[ERRORE] Parametri non validi. Riprova.")
+            params = ask_noise_params()
+            if params is None:
                 continue
+            dur, sr, amp = params
 
             current_buffer = generate_white_noise(duration_sec=dur, sample_rate=sr, amplitude=amp)
             current_sr = sr
@@ -284,8 +369,16 @@ def main():
             print("[INFO] Uscita dal mini terminale. A presto!")
             break
 
+        elif choice == "7":
+            # Nessun buffer necessario: il rumore viene generato durante la riproduzione
+            params = ask_noise_params()
+            if params is None:
+                continue
+            dur, sr, amp = params
+            stream_white_noise(duration_sec=dur, sample_rate=sr, amplitude=amp)
+
         else:
-            print("[ERRORE] Scelta non valida. Inserisci un numero tra 1 e 6.")
+            print("[ERRORE] Scelta non valida. Inserisci un numero tra 1 e 7.")
 
 
 if __name__ == "__main__":
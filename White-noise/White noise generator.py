@@ -1,9 +1,21 @@
+import os
 import numpy as np
+import scipy.fft
 import matplotlib.pyplot as plt
 from scipy.io.wavfile import write
 from scipy.signal import welch
 import sounddevice as sd   # <--- libreria per riproduzione audio
 
+# optional gpu offload with cupy: used only if it is installed, a cuda device is present
+# and cupyx provides welch (older cupy releases don't have it)
+try:
+    import cupy as cp
+    import cupyx.scipy.signal
+    if cp.cuda.runtime.getDeviceCount() == 0 or not hasattr(cupyx.scipy.signal, "welch"):
+        cp = None
+except Exception:
+    cp = None
+
 # parameters
 duration = 120  # seconds
 sampling_rate = 43100  # samples per second (Hz)
@@ -11,8 +23,15 @@ sampling_rate = 43100  # samples per second (Hz)
 # total number of samples
 total_samples = duration * sampling_rate
 
-# generate white noise
-white_noise = np.random.normal(0, 1, total_samples)
+# generate white noise (drawn directly as float32, no float64 copy)
+if cp is not None:
+    # drawn on the gpu, but plot, wav and playback need the full buffer in host memory too,
+    # so host memory use is the same as the cpu path: only the generation and the psd run on the gpu
+    white_noise_gpu = cp.random.standard_normal(total_samples, dtype=cp.float32)
+    white_noise = cp.asnumpy(white_noise_gpu)
+else:
+    rng = np.random.default_rng()
+    white_noise = rng.standard_normal(total_samples, dtype=np.float32)
 
 # plot the white noise (first 1000 samples)
 plt.figure(figsize=(10, 4))
@@ -24,15 +43,32 @@ plt.show()
 
 # save the white noise as a wav file
 
-write('white_noise.wav', sampling_rate, white_noise.astype(np.float32))
+write('white_noise.wav', sampling_rate, white_noise)
 
 # --- PLAY AUDIO ---
 print("Riproduzione in corso... attenzione al volume!")
 sd.play(white_noise, samplerate=sampling_rate)
 sd.wait()   # blocca finché la riproduzione non è finita
 
-# compute the power spectral density
-frequencies, power_spectral_density = welch(white_noise, fs=sampling_rate, nperseg=1024)
+# compute the power spectral density (segment length rounded up to a fast FFT size)
+nperseg = scipy.fft.next_fast_len(1024, real=True)
+if cp is not None:
+    # welch on the gpu copy of the noise, results copied back for matplotlib
+    frequencies, power_spectral_density = cupyx.scipy.signal.welch(white_noise_gpu, fs=sampling_rate, nperseg=nperseg)
+    frequencies = cp.asnumpy(frequencies)
+    power_spectral_density = cp.asnumpy(power_spectral_density)
+else:
+    # use pyFFTW (multithreaded, with cached plans) as the FFT backend for welch if it is installed,
+    # otherwise scipy's own pocketfft is used
+    try:
+        import pyfftw
+        from pyfftw.interfaces import scipy_fft as pyfftw_scipy_fft
+        pyfftw.interfaces.cache.enable()
+        pyfftw.config.NUM_THREADS = os.cpu_count() or 1
+        scipy.fft.set_global_backend(pyfftw_scipy_fft)
+    except ImportError:
+        pass
+    frequencies, power_spectral_density = welch(white_noise, fs=sampling_rate, nperseg=nperseg)
 
 # plot the power spectral density
 plt.figure(figsize=(10, 4))